@@ -22,7 +22,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     .block-container { padding-top: 1.5rem; }
     .stMetric > div { background: #f8f9fa; padding: 12px 16px; border-radius: 8px; }
@@ -38,7 +38,20 @@ st.markdown("""
     /* Ensure selected menu icon inherits white color */
     .nav-link-selected .icon { color: inherit !important; }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+# Not cached: Streamlit replays elements emitted inside cached functions on
+# every rerun, so a cache decorator would not skip the injection.
+def inject_css():
+    """Inject custom CSS into the page."""
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+
+@st.cache_data(ttl=60)
+def last_updated() -> str:
+    """Timestamp for the sidebar caption (recomputed at most once a minute)."""
+    return datetime.now().strftime('%Y-%m-%d %H:%M')
 
 
 @st.cache_resource
@@ -46,7 +59,7 @@ def init_dashboard():
     """Initialize dashboard components."""
     try:
         data_loader = DashboardDataLoader()
-        metrics = DashboardMetrics()
+        metrics = DashboardMetrics(data_loader)
         chart_gen = ChartGenerator()
         return data_loader, metrics, chart_gen
     except Exception as e:
@@ -101,17 +114,9 @@ def render_sidebar():
         )
 
     st.sidebar.markdown("---")
-    st.sidebar.subheader("Date Range")
-    lookback_days = st.sidebar.selectbox(
-        "Lookback Period",
-        [7, 30, 90, 180, 365, "All"],
-        index=2
-    )
+    st.sidebar.caption(f"Last updated: {last_updated()}")
 
-    st.sidebar.markdown("---")
-    st.sidebar.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-
-    return page, lookback_days if lookback_days != "All" else None
+    return page
 
 
 @st.cache_data(ttl=3600)
@@ -330,15 +335,25 @@ def render_risk(data_loader, metrics, chart_gen, days):
         st.metric("Max Drawdown Limit", f"{risk_status['max_drawdown_limit']*100:.0f}%")
 
 
-def main():
-    """Main dashboard application."""
-    data_loader, metrics, chart_gen = init_dashboard()
+def render_lookback_selector():
+    """Render the lookback period selector and return the number of days."""
+    _, col = st.columns([4, 1])
+    with col:
+        lookback_days = st.selectbox(
+            "Lookback Period",
+            [7, 30, 90, 180, 365, "All"],
+            index=2,
+            key="lookback_days"
+        )
+    return lookback_days if lookback_days != "All" else None
 
-    if data_loader is None:
-        st.error("Failed to initialize dashboard components.")
-        return
 
-    page, days = render_sidebar()
+# Changing the lookback period only reruns this fragment; the sidebar and
+# page chrome are rebuilt only when the page selection changes.
+@st.fragment
+def render_page(page, data_loader, metrics, chart_gen):
+    """Render the selected page for the chosen lookback period."""
+    days = render_lookback_selector()
 
     if page == "Overview":
         render_overview(data_loader, metrics, chart_gen, days)
@@ -352,5 +367,18 @@ def main():
         render_risk(data_loader, metrics, chart_gen, days)
 
 
+def main():
+    """Main dashboard application."""
+    inject_css()
+    data_loader, metrics, chart_gen = init_dashboard()
+
+    if data_loader is None:
+        st.error("Failed to initialize dashboard components.")
+        return
+
+    page = render_sidebar()
+    render_page(page, data_loader, metrics, chart_gen)
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,187 @@
+"""
+Numeric Kernels
+
+Single-pass loops over equity and return arrays, JIT-compiled with Numba
+when it is installed and falling back to NumPy otherwise.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # error_model='numpy' gives IEEE division (NaN/inf on a zero peak)
+    # instead of Python's ZeroDivisionError, matching the pandas results
+    @njit(cache=True, error_model='numpy')
+    def running_dd(equity: np.ndarray) -> np.ndarray:
+        """Drawdown from the running peak at every point of ``equity``; NaNs do not set the peak."""
+        n = equity.shape[0]
+        out = np.empty(n)
+        peak = np.nan
+        for i in range(n):
+            value = equity[i]
+            if value > peak or (np.isnan(peak) and not np.isnan(value)):
+                peak = value
+            out[i] = (value - peak) / peak
+        return out
+
+    @njit(cache=True, error_model='numpy')
+    def max_drawdown(equity: np.ndarray) -> float:
+        """
+        Largest drawdown from the running peak, without building the series.
+
+        Points with a NaN value or a zero peak have no defined drawdown and are
+        skipped, like ``Series.min``; NaN if no point qualifies.
+        """
+        n = equity.shape[0]
+        if n == 0:
+            return 0.0
+        peak = np.nan
+        worst = np.nan
+        for i in range(n):
+            value = equity[i]
+            if value > peak or (np.isnan(peak) and not np.isnan(value)):
+                peak = value
+            if np.isnan(value) or np.isnan(peak) or peak == 0:
+                continue
+            drawdown = value / peak - 1.0
+            if np.isnan(worst) or drawdown < worst:
+                worst = drawdown
+        return worst
+
+    @njit(cache=True)
+    def pnl_partition(pnl: np.ndarray):
+        """
+        Winning values, losing values and running total of ``pnl`` in one pass.
+
+        Zeros are in neither partition; NaNs are skipped by the running total
+        and left as NaN in it, like ``Series.cumsum``.
+        """
+        n = pnl.shape[0]
+        wins = np.empty(n)
+        losses = np.empty(n)
+        cumulative = np.empty(n)
+        n_wins = 0
+        n_losses = 0
+        total = 0.0
+        for i in range(n):
+            value = pnl[i]
+            if np.isnan(value):
+                cumulative[i] = np.nan
+                continue
+            if value > 0:
+                wins[n_wins] = value
+                n_wins += 1
+            elif value < 0:
+                losses[n_losses] = value
+                n_losses += 1
+            total += value
+            cumulative[i] = total
+        return wins[:n_wins], losses[:n_losses], cumulative
+
+    @njit(cache=True)
+    def return_stats(returns: np.ndarray):
+        """
+        Mean, sample std, downside count and downside sample std of ``returns``.
+
+        Both moments are accumulated in the same pass with Welford's update;
+        the stds are NaN when fewer than two values contribute.
+        """
+        n = 0
+        mean = 0.0
+        m2 = 0.0
+        nd = 0
+        down_mean = 0.0
+        down_m2 = 0.0
+        for x in returns:
+            n += 1
+            delta = x - mean
+            mean += delta / n
+            m2 += delta * (x - mean)
+            if x < 0:
+                nd += 1
+                down_delta = x - down_mean
+                down_mean += down_delta / nd
+                down_m2 += down_delta * (x - down_mean)
+        std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+        downside_std = np.sqrt(down_m2 / (nd - 1)) if nd > 1 else np.nan
+        return mean, std, nd, downside_std
+else:
+    def running_dd(equity: np.ndarray) -> np.ndarray:
+        """Drawdown from the running peak at every point of ``equity``; NaNs do not set the peak."""
+        running_max = np.fmax.accumulate(equity)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (equity - running_max) / running_max
+
+    def max_drawdown(equity: np.ndarray) -> float:
+        """Largest drawdown from the running peak, skipping NaN and zero-peak points."""
+        if equity.size == 0:
+            return 0.0
+        running_max = np.fmax.accumulate(equity)
+        valid = ~np.isnan(equity) & (running_max != 0)
+        if not valid.any():
+            return np.nan
+        return float(np.min(equity[valid] / running_max[valid])) - 1.0
+
+    def pnl_partition(pnl: np.ndarray):
+        """Winning values, losing values and running total of ``pnl``."""
+        cumulative = np.where(np.isnan(pnl), np.nan, np.nancumsum(pnl))
+        return pnl[pnl > 0], pnl[pnl < 0], cumulative
+
+    def return_stats(returns: np.ndarray):
+        """Mean, sample std, downside count and downside sample std of ``returns``."""
+        downside = returns[returns < 0]
+        mean = returns.mean() if returns.size else 0.0
+        std = returns.std(ddof=1) if returns.size > 1 else np.nan
+        downside_std = downside.std(ddof=1) if downside.size > 1 else np.nan
+        return mean, std, downside.size, downside_std
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    """
+    n = x.shape[0]
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0] = 0
+    out[n_out - 1] = n - 1
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        range_start = int(i * every) + 1
+        range_end = int((i + 1) * every) + 1
+        ax = x[a]
+        ay = y[a]
+        max_area = -1.0
+        next_a = range_start
+        for j in range(range_start, range_end):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > max_area:
+                max_area = area
+                next_a = j
+        out[i + 1] = next_a
+        a = next_a
+    return out
+
+
+if NUMBA_AVAILABLE:
+    lttb_indices = njit(cache=True)(_lttb_indices)
+else:
+    lttb_indices = _lttb_indices
@@ -2,15 +2,31 @@
 Simplified configuration loader for dashboard.
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
+import os
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+@lru_cache(maxsize=8)
+def _parse_config(config_path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML file once per (path, mtime) pair."""
+    with open(config_path, 'r') as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
 
 def load_config(config_path: str) -> Dict[str, Any]:
     """
     Load configuration from YAML file.
 
+    Parsed files are cached until their modification time changes.
+
     Args:
         config_path: Path to YAML config file
 
@@ -18,8 +34,7 @@ def load_config(config_path: str) -> Dict[str, Any]:
         Dictionary with configuration
     """
     try:
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f) or {}
+        return dict(_parse_config(config_path, os.stat(config_path).st_mtime_ns))
     except FileNotFoundError:
         return {}
     except Exception:
@@ -7,11 +7,212 @@ Loads data from paper trading files for dashboard display.
 from datetime import datetime, timedelta, date
 from pathlib import Path
 from typing import Dict, List, Optional, Any
+import os
+import tempfile
 import pandas as pd
 import numpy as np
-import json
+import streamlit as st
+import orjson
 
 from .config import load_config
+from ._kernels import max_drawdown, running_dd, return_stats
+
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Snapshot of the daily logs, kept next to the daily_logs directory so that
+# rewriting it does not bump that directory's mtime. Each row carries the
+# name and mtime of the log it came from.
+EQUITY_CACHE_FILE = "daily_logs.parquet"
+SNAPSHOT_COLUMNS = ['file', 'mtime_ns', 'date', 'equity']
+
+# Window for the Risk page's current drawdown: the latest equity against the
+# peak of the last RISK_LOOKBACK_DAYS days. metrics_snapshot.json's
+# current_drawdown must use the same definition (see README).
+RISK_LOOKBACK_DAYS = 90
+
+
+# Cache entries are keyed on file/directory mtimes, so a changed file gets a
+# fresh parse on the next rerun; the TTL bounds staleness for edits the key
+# does not see (e.g. rewriting an older daily log in place), which the
+# snapshot then picks up from that log's mtime.
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_json(path: str, mtime_ns: int) -> Any:
+    """Load a JSON file (``mtime_ns`` is only used as part of the cache key)."""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def _logs_mtime_ns(logs_dir: Path) -> int:
+    """
+    Cache key for the daily logs directory.
+
+    The later of the directory mtime (files added or removed) and the newest
+    log's mtime (today's log rewritten in place).
+    """
+    latest = None
+    with os.scandir(logs_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json') and (latest is None or entry.name > latest.name):
+                latest = entry
+
+    mtime_ns = logs_dir.stat().st_mtime_ns
+    if latest is not None:
+        mtime_ns = max(mtime_ns, latest.stat().st_mtime_ns)
+    return mtime_ns
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_daily_logs(logs_dir: str, mtime_ns: int, start_date: str = '') -> pd.DataFrame:
+    """
+    Equity curve from the daily logs in ``logs_dir``, from ``start_date`` on.
+
+    Only used with ``start_date`` when there is no Parquet snapshot: log files
+    are named ``YYYY-MM-DD.json``, so files before it are skipped by name and
+    never decoded. Dates are normalized and sorted here.
+    """
+    if PARQUET_AVAILABLE:
+        df = _refresh_equity_cache(logs_dir)
+    else:
+        df = _parse_daily_logs(logs_dir, start_name=start_date)
+
+    df['date'] = df['date'].dt.normalize()
+    if start_date:
+        df = df[df['date'] >= pd.Timestamp(start_date)]
+    return df.sort_values('date')
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_trade_history(path: str, mtime_ns: int) -> pd.DataFrame:
+    """Full trade history with normalized dates."""
+    with open(path, 'rb') as f:
+        trades = orjson.loads(f.read())
+
+    if not trades:
+        return pd.DataFrame()
+
+    # Build columns directly rather than letting pandas walk the list of dicts
+    columns = dict.fromkeys(key for trade in trades for key in trade)
+    data = {key: [trade.get(key) for trade in trades] for key in columns}
+    data['date'] = pd.to_datetime(data['date'], format='ISO8601', cache=True).normalize()
+    for key in ('action', 'symbol'):
+        if key in data:
+            data[key] = pd.Categorical(data[key])
+
+    return pd.DataFrame(data)
+
+
+def _read_daily_log(path: str):
+    """``(date, total_equity)`` from one daily log, or None if it has no portfolio."""
+    try:
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read())
+        if 'portfolio' in data:
+            return data['date'], data['portfolio'].get('total_equity', 0)
+    except Exception:
+        pass
+    return None
+
+
+def _parse_daily_logs(logs_dir: str, start_name: str = '') -> pd.DataFrame:
+    """Parse the daily logs whose file name sorts at or after ``start_name``."""
+    with os.scandir(logs_dir) as entries:
+        log_files = sorted(
+            (e for e in entries if e.name.endswith('.json') and e.name >= start_name),
+            key=lambda e: e.name
+        )
+
+    dates = []
+    equities = []
+    for log_file in log_files:
+        row = _read_daily_log(log_file.path)
+        if row is not None:
+            dates.append(row[0])
+            equities.append(row[1])
+
+    return pd.DataFrame({
+        'date': pd.to_datetime(dates, format='ISO8601', cache=True),
+        'equity': np.asarray(equities, dtype=np.float64),
+    })
+
+
+def _refresh_equity_cache(logs_dir: str) -> pd.DataFrame:
+    """
+    Reconcile the Parquet snapshot with the daily logs and return the equity rows.
+
+    Snapshot rows whose log still exists with the same mtime are reused; new
+    and rewritten logs are parsed, and rows of deleted logs are dropped. Logs
+    without a portfolio section are recorded too (with no date) so they are
+    not re-read every time. The snapshot is only rewritten when it changed.
+    """
+    cache_file = Path(logs_dir).parent / EQUITY_CACHE_FILE
+
+    # stat before reading, so a log rewritten mid-parse looks stale next time
+    with os.scandir(logs_dir) as entries:
+        logs = {e.name: (e.path, e.stat().st_mtime_ns) for e in entries if e.name.endswith('.json')}
+
+    cached = None
+    if cache_file.exists():
+        try:
+            cached = pd.read_parquet(cache_file, engine='pyarrow')
+        except Exception:
+            cached = None
+    if cached is None or list(cached.columns) != SNAPSHOT_COLUMNS:
+        cached = pd.DataFrame({
+            'file': pd.Series(dtype=object),
+            'mtime_ns': pd.Series(dtype=np.int64),
+            'date': pd.Series(dtype='datetime64[ns]'),
+            'equity': pd.Series(dtype=np.float64),
+        })
+
+    current = np.fromiter(
+        (name in logs and logs[name][1] == mtime_ns
+         for name, mtime_ns in zip(cached['file'], cached['mtime_ns'])),
+        dtype=bool, count=len(cached)
+    )
+    kept = cached[current]
+    stale = sorted(logs.keys() - set(kept['file']))
+
+    if stale:
+        rows = [_read_daily_log(logs[name][0]) for name in stale]
+        parsed = pd.DataFrame({
+            'file': stale,
+            'mtime_ns': np.asarray([logs[name][1] for name in stale], dtype=np.int64),
+            'date': pd.to_datetime([r[0] if r else None for r in rows], format='ISO8601', cache=True),
+            'equity': np.asarray([r[1] if r else np.nan for r in rows], dtype=np.float64),
+        })
+        snapshot = pd.concat([kept, parsed], ignore_index=True) if not kept.empty else parsed
+    else:
+        snapshot = kept
+
+    if stale or len(kept) != len(cached):
+        _write_snapshot(snapshot, cache_file)
+
+    equity = snapshot.loc[snapshot['date'].notna(), ['date', 'equity']]
+    return equity.reset_index(drop=True)
+
+
+def _write_snapshot(snapshot: pd.DataFrame, cache_file: Path) -> None:
+    """Replace ``cache_file`` atomically, so concurrent sessions never read a partial file."""
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix=cache_file.name, suffix='.tmp')
+    except OSError:
+        return
+    os.close(fd)
+
+    # The snapshot is only an accelerator; failing to write it is not an error
+    try:
+        snapshot.to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False)
+        os.replace(tmp_path, cache_file)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
 
 
 class DashboardDataLoader:
@@ -27,15 +228,21 @@ class DashboardDataLoader:
         paper_portfolio_file = self.data_dir / "paper_trading" / "portfolio_state.json"
 
         if paper_portfolio_file.exists():
-            with open(paper_portfolio_file, 'r') as f:
-                data = json.load(f)
+            data = _load_json(str(paper_portfolio_file), paper_portfolio_file.stat().st_mtime_ns)
 
             cash = data.get('cash', 100000)
             positions = data.get('positions', {})
-            invested = sum(
-                p.get('quantity', 0) * p.get('current_price', p.get('avg_price', 0))
-                for p in positions.values()
-            )
+            invested = 0.0
+            if positions:
+                quantities = np.fromiter(
+                    (p.get('quantity', 0) for p in positions.values()),
+                    dtype=np.float64, count=len(positions)
+                )
+                prices = np.fromiter(
+                    (p.get('current_price', p.get('avg_price', 0)) for p in positions.values()),
+                    dtype=np.float64, count=len(positions)
+                )
+                invested = float(quantities @ prices)
             initial = data.get('initial_capital', 100000)
             total_equity = cash + invested
 
@@ -65,15 +272,24 @@ class DashboardDataLoader:
             return {}
 
         returns = equity_curve['equity'].pct_change().dropna()
+        mean, std, downside_count, downside_std = return_stats(returns.to_numpy(dtype=np.float64))
+
+        sharpe = 0.0
+        if not returns.empty and std != 0:
+            sharpe = (mean / std) * np.sqrt(252)
+
+        sortino = 0.0
+        if downside_count > 0 and downside_std != 0:
+            sortino = (mean / downside_std) * np.sqrt(252)
 
         metrics = {
             'total_return_pct': (equity_curve['equity'].iloc[-1] / equity_curve['equity'].iloc[0] - 1),
             'annual_return_pct': self._annualize_return(returns),
-            'sharpe_ratio': self._calculate_sharpe(returns),
-            'sortino_ratio': self._calculate_sortino(returns),
+            'sharpe_ratio': sharpe,
+            'sortino_ratio': sortino,
             'max_drawdown': self._calculate_max_drawdown(equity_curve['equity']),
             'win_rate': self._calculate_win_rate(days),
-            'volatility': returns.std() * np.sqrt(252),
+            'volatility': std * np.sqrt(252),
             'calmar_ratio': 0.0,
         }
 
@@ -87,28 +303,19 @@ class DashboardDataLoader:
         paper_trading_logs = self.data_dir / "paper_trading" / "daily_logs"
 
         if paper_trading_logs.exists():
-            equity_data = []
-            for log_file in sorted(paper_trading_logs.glob("*.json")):
-                try:
-                    with open(log_file, 'r') as f:
-                        data = json.load(f)
-                        if 'portfolio' in data:
-                            equity_data.append({
-                                'date': data['date'],
-                                'equity': data['portfolio'].get('total_equity', 0)
-                            })
-                except:
-                    continue
-
-            if equity_data:
-                df = pd.DataFrame(equity_data)
-                df['date'] = pd.to_datetime(df['date']).dt.normalize()
-                df = df.sort_values('date')
-
-                if days:
-                    cutoff_date = pd.Timestamp.now().normalize() - timedelta(days=days)
-                    df = df[df['date'] >= cutoff_date]
-
+            start_date = ''
+            if days:
+                cutoff_date = pd.Timestamp.now().normalize() - timedelta(days=days)
+                start_date = cutoff_date.strftime('%Y-%m-%d')
+
+            # With the snapshot the full curve is cached once and sliced per
+            # window; without it the cutoff saves parsing the older files
+            load_from = '' if PARQUET_AVAILABLE else start_date
+            df = _load_daily_logs(str(paper_trading_logs), _logs_mtime_ns(paper_trading_logs), load_from)
+            if start_date and PARQUET_AVAILABLE:
+                df = df[df['date'] >= pd.Timestamp(start_date)]
+
+            if not df.empty:
                 return df
 
         return pd.DataFrame(columns=['date', 'equity'])
@@ -120,8 +327,7 @@ class DashboardDataLoader:
         if equity_curve.empty:
             return pd.DataFrame()
 
-        running_max = equity_curve['equity'].expanding().max()
-        drawdown = (equity_curve['equity'] - running_max) / running_max
+        drawdown = running_dd(equity_curve['equity'].to_numpy(dtype=np.float64))
 
         return pd.DataFrame({
             'date': equity_curve['date'],
@@ -134,13 +340,9 @@ class DashboardDataLoader:
 
         if paper_trades_file.exists():
             try:
-                with open(paper_trades_file, 'r') as f:
-                    trades = json.load(f)
-
-                if trades:
-                    df = pd.DataFrame(trades)
-                    df['date'] = pd.to_datetime(df['date']).dt.normalize()
+                df = _load_trade_history(str(paper_trades_file), paper_trades_file.stat().st_mtime_ns)
 
+                if not df.empty:
                     if days:
                         cutoff_date = pd.Timestamp.now().normalize() - timedelta(days=days)
                         df = df[df['date'] >= cutoff_date]
@@ -151,6 +353,18 @@ class DashboardDataLoader:
 
         return pd.DataFrame()
 
+    def get_precomputed_metrics(self) -> Dict[str, Any]:
+        """Get aggregates written by the paper trader, or {} if there are none."""
+        snapshot_file = self.data_dir / "paper_trading" / "metrics_snapshot.json"
+
+        if snapshot_file.exists():
+            try:
+                return _load_json(str(snapshot_file), snapshot_file.stat().st_mtime_ns)
+            except:
+                pass
+
+        return {}
+
     def get_risk_status(self) -> Dict[str, Any]:
         """Get current risk status."""
         portfolio = self.get_portfolio_status()
@@ -160,12 +374,16 @@ class DashboardDataLoader:
         invested = portfolio.get('invested', 0)
         num_positions = len(portfolio.get('positions', {}))
 
-        equity_curve = self.get_equity_curve(days=90)
+        snapshot = self.get_precomputed_metrics()
         current_drawdown = 0.0
-        if not equity_curve.empty:
-            peak = equity_curve['equity'].max()
-            current = equity_curve['equity'].iloc[-1]
-            current_drawdown = (current - peak) / peak if peak > 0 else 0
+        if 'current_drawdown' in snapshot:
+            current_drawdown = snapshot['current_drawdown']
+        else:
+            equity_curve = self.get_equity_curve(days=RISK_LOOKBACK_DAYS)
+            if not equity_curve.empty:
+                peak = equity_curve['equity'].max()
+                current = equity_curve['equity'].iloc[-1]
+                current_drawdown = (current - peak) / peak if peak > 0 else 0
 
         return {
             'portfolio_exposure': invested / total_equity if total_equity > 0 else 0,
@@ -186,30 +404,15 @@ class DashboardDataLoader:
             return 0.0
         return (1 + total_return) ** (252 / num_days) - 1
 
-    def _calculate_sharpe(self, returns: pd.Series) -> float:
-        if returns.empty or returns.std() == 0:
-            return 0.0
-        return (returns.mean() / returns.std()) * np.sqrt(252)
-
-    def _calculate_sortino(self, returns: pd.Series) -> float:
-        if returns.empty:
-            return 0.0
-        downside_returns = returns[returns < 0]
-        if downside_returns.empty or downside_returns.std() == 0:
-            return 0.0
-        return (returns.mean() / downside_returns.std()) * np.sqrt(252)
-
     def _calculate_max_drawdown(self, equity: pd.Series) -> float:
         if equity.empty:
             return 0.0
-        running_max = equity.expanding().max()
-        drawdown = (equity - running_max) / running_max
-        return drawdown.min()
+        return max_drawdown(equity.to_numpy(dtype=np.float64))
 
     def _calculate_win_rate(self, days: int) -> float:
         trades = self.get_trade_history(days=days)
         if trades.empty or 'pnl' not in trades.columns:
             return 0.0
-        winning_trades = len(trades[trades['pnl'] > 0])
-        return winning_trades / len(trades)
+        pnl = trades['pnl'].to_numpy(dtype=np.float64)
+        return np.count_nonzero(pnl > 0) / pnl.size
 
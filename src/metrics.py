@@ -5,18 +5,39 @@ Calculates metrics for the dashboard display.
 """
 
 from typing import Dict, Any
-from pathlib import Path
 import pandas as pd
 import numpy as np
-import json
+
+from .data_loader import DashboardDataLoader, _load_json
+from ._kernels import max_drawdown, return_stats
+
+# Annual risk-free rate used by the Sharpe and Sortino ratios
+RISK_FREE_RATE = 0.02
+
+
+def _sharpe(mean: float, std: float, n: int, risk_free_rate: float = RISK_FREE_RATE) -> float:
+    """Annualized Sharpe ratio from the mean and sample std of ``n`` daily returns."""
+    if n < 2 or std == 0:
+        return 0.0
+    return (mean * 252 - risk_free_rate) / (std * np.sqrt(252))
+
+
+def _sortino(mean: float, downside_std: float, downside_count: int,
+             risk_free_rate: float = RISK_FREE_RATE) -> float:
+    """Annualized Sortino ratio; inf when no daily return was negative."""
+    if downside_count == 0:
+        return float('inf')
+    downside_std = downside_std * np.sqrt(252)
+    return (mean * 252 - risk_free_rate) / downside_std if downside_std > 0 else 0
 
 
 class DashboardMetrics:
     """Calculate metrics for dashboard display."""
 
-    def __init__(self):
-        """Initialize metrics calculator."""
-        self.data_dir = Path("data")
+    def __init__(self, loader: DashboardDataLoader):
+        """Initialize metrics calculator on top of the dashboard data loader."""
+        self._loader = loader
+        self.data_dir = loader.data_dir
         self.paper_trading_dir = self.data_dir / "paper_trading"
 
     def get_portfolio_summary(self) -> Dict[str, Any]:
@@ -32,17 +53,23 @@ class DashboardMetrics:
                 'unrealized_pnl': 0
             }
 
-        with open(state_file, 'r') as f:
-            state = json.load(f)
+        state = _load_json(str(state_file), state_file.stat().st_mtime_ns)
 
         initial = state.get('initial_capital', 100000)
         cash = state.get('cash', initial)
         positions = state.get('positions', {})
 
-        positions_value = sum(
-            p.get('quantity', 0) * p.get('current_price', 0)
-            for p in positions.values()
-        )
+        positions_value = 0.0
+        if positions:
+            quantities = np.fromiter(
+                (p.get('quantity', 0) for p in positions.values()),
+                dtype=np.float64, count=len(positions)
+            )
+            prices = np.fromiter(
+                (p.get('current_price', 0) for p in positions.values()),
+                dtype=np.float64, count=len(positions)
+            )
+            positions_value = float(quantities @ prices)
 
         total_equity = cash + positions_value
         total_return_pct = ((total_equity / initial) - 1) * 100 if initial > 0 else 0
@@ -70,8 +97,7 @@ class DashboardMetrics:
                 'avg_pnl': 0
             }
 
-        with open(trades_file, 'r') as f:
-            trades = json.load(f)
+        trades = _load_json(str(trades_file), trades_file.stat().st_mtime_ns)
 
         if not trades:
             return {
@@ -95,66 +121,46 @@ class DashboardMetrics:
                 'avg_pnl': 0
             }
 
-        pnls = [t.get('pnl', 0) for t in closed_trades]
-        winning = sum(1 for pnl in pnls if pnl > 0)
-        losing = sum(1 for pnl in pnls if pnl < 0)
+        pnls = np.fromiter(
+            (t.get('pnl', 0) for t in closed_trades),
+            dtype=np.float64, count=len(closed_trades)
+        )
+        winning = int(np.count_nonzero(pnls > 0))
+        losing = int(np.count_nonzero(pnls < 0))
 
         return {
             'total_trades': len(trades),
             'closed_trades': len(closed_trades),
             'winning_trades': winning,
             'losing_trades': losing,
-            'win_rate': (winning / len(closed_trades) * 100) if closed_trades else 0,
-            'total_pnl': sum(pnls),
-            'avg_pnl': np.mean(pnls) if pnls else 0,
-            'best_trade': max(pnls) if pnls else 0,
-            'worst_trade': min(pnls) if pnls else 0
+            'win_rate': winning / len(closed_trades) * 100,
+            'total_pnl': float(pnls.sum()),
+            'avg_pnl': float(pnls.mean()),
+            'best_trade': float(pnls.max()),
+            'worst_trade': float(pnls.min())
         }
 
-    def calculate_sharpe_ratio(self, returns: pd.Series, risk_free_rate: float = 0.02) -> float:
+    def calculate_sharpe_ratio(self, returns: pd.Series, risk_free_rate: float = RISK_FREE_RATE) -> float:
         """Calculate Sharpe ratio from returns series."""
-        if returns.empty or len(returns) < 2 or returns.std() == 0:
+        if returns.empty:
             return 0.0
-        mean_return = returns.mean() * 252
-        std_return = returns.std() * np.sqrt(252)
-        return (mean_return - risk_free_rate) / std_return
+        mean, std, _, _ = return_stats(returns.to_numpy(dtype=np.float64))
+        return _sharpe(mean, std, len(returns), risk_free_rate)
 
     def calculate_max_drawdown(self, equity_curve: pd.Series) -> float:
         """Calculate maximum drawdown from equity curve."""
         if equity_curve.empty:
             return 0.0
-        running_max = equity_curve.cummax()
-        drawdown = (equity_curve / running_max - 1) * 100
-        return drawdown.min()
+        return max_drawdown(equity_curve.to_numpy(dtype=np.float64)) * 100
 
     def get_daily_returns(self, days: int = 30) -> pd.Series:
         """Get daily returns from equity curve."""
-        daily_logs = self.paper_trading_dir / "daily_logs"
-
-        if not daily_logs.exists():
-            return pd.Series()
+        equity_curve = self._loader.get_equity_curve()
 
-        equity_data = []
-        for log_file in sorted(daily_logs.glob("*.json")):
-            try:
-                with open(log_file, 'r') as f:
-                    data = json.load(f)
-                    if 'portfolio' in data:
-                        equity_data.append({
-                            'date': data['date'],
-                            'equity': data['portfolio'].get('total_equity', 0)
-                        })
-            except:
-                continue
-
-        if not equity_data:
+        if equity_curve.empty:
             return pd.Series()
 
-        df = pd.DataFrame(equity_data)
-        df['date'] = pd.to_datetime(df['date'])
-        df = df.sort_values('date').set_index('date')
-
-        returns = df['equity'].pct_change().dropna()
+        returns = equity_curve.set_index('date')['equity'].pct_change().dropna()
 
         if days and len(returns) > days:
             returns = returns.tail(days)
@@ -176,16 +182,11 @@ class DashboardMetrics:
                 'annual_return_pct': 0
             }
 
-        sharpe = self.calculate_sharpe_ratio(returns)
-
-        negative_returns = returns[returns < 0]
-        if len(negative_returns) > 0:
-            downside_std = negative_returns.std() * np.sqrt(252)
-            sortino = (returns.mean() * 252 - 0.02) / downside_std if downside_std > 0 else 0
-        else:
-            sortino = float('inf')
+        mean, std, downside_count, downside_std = return_stats(returns.to_numpy(dtype=np.float64))
+        sharpe = _sharpe(mean, std, len(returns))
+        sortino = _sortino(mean, downside_std, downside_count)
 
-        volatility = returns.std() * np.sqrt(252) * 100
+        volatility = std * np.sqrt(252) * 100
         total_return = ((1 + returns).prod() - 1) * 100
 
         trading_days = len(returns)
@@ -4,21 +4,135 @@ Dashboard Visualizations Module
 Chart generation using Plotly.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from collections import OrderedDict
+import functools
+import inspect
+import threading
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 import numpy as np
 from datetime import datetime, timedelta
 
 try:
     import plotly.graph_objects as go
+    import plotly.io as pio
+    # Streamlit serializes every figure through plotly.io.to_json; the orjson
+    # engine is several times faster than the stdlib one on large arrays
+    pio.json.config.default_engine = 'orjson'
     PLOTLY_AVAILABLE = True
 except ImportError:
     PLOTLY_AVAILABLE = False
 
+from ._kernels import lttb_indices, pnl_partition
+
+# Raw (traces, layout) dicts a chart is built from; see ChartGenerator._figure
+ChartSpec = Tuple[List[dict], dict]
+
+
+def _arg_fingerprint(value):
+    """Hashable stand-in for a plot argument; DataFrames are keyed on their contents."""
+    if not isinstance(value, pd.DataFrame):
+        return value
+    try:
+        row_hashes = pd.util.hash_pandas_object(value, index=True).to_numpy()
+    except TypeError:
+        # Nested values (lists, dicts from the trade log) are unhashable;
+        # key those columns on their string form instead
+        nested = {c: str for c in value.columns if value[c].dtype == object}
+        row_hashes = pd.util.hash_pandas_object(value.astype(nested), index=True).to_numpy()
+    return (value.shape, tuple(value.columns), tuple(map(str, value.dtypes)),
+            hash(row_hashes.tobytes()))
+
+
+def _needs_plotly(method):
+    """Return None from a ``plot_*`` method when Plotly is missing or its first frame is empty."""
+    # The frame may be passed positionally or by its parameter name
+    frame_param = list(inspect.signature(method).parameters)[1]
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if args:
+            data = args[0]
+        elif frame_param in kwargs:
+            data = kwargs[frame_param]
+        else:
+            # Missing frame: let the call raise the usual TypeError
+            return method(self, *args, **kwargs)
+        if not PLOTLY_AVAILABLE or data is None or data.empty:
+            return None
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _cached_spec(method):
+    """
+    Memoize a ``_*_spec`` method on a fingerprint of its arguments.
+
+    Specs rather than figures are cached, so every ``plot_*`` call builds a
+    new figure that its caller is free to mutate. The least recently used
+    entries are evicted once the generator holds ``max_cached_figures``.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__,
+               tuple(_arg_fingerprint(a) for a in args),
+               tuple((k, _arg_fingerprint(v)) for k, v in sorted(kwargs.items())))
+        cache = self._figure_cache
+        with self._figure_cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+
+        spec = method(self, *args, **kwargs)
+
+        with self._figure_cache_lock:
+            cache[key] = spec
+            while len(cache) > self.max_cached_figures:
+                cache.popitem(last=False)
+        return spec
+    return wrapper
+
 
 class ChartGenerator:
     """Generate charts for dashboard visualization."""
 
+    # Fixed layouts, shared by every call; treat as read-only
+    _DATE_AXIS = dict(title=dict(text='Date'), type='date', tickformat='%Y-%m-%d', tickangle=-45)
+    _ZERO_LINE = dict(type='line', xref='x domain', x0=0, x1=1, yref='y', y0=0, y1=0)
+
+    _EQUITY_LAYOUT = dict(
+        title=dict(text='Portfolio Equity Curve'),
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        xaxis=_DATE_AXIS,
+        yaxis=dict(title=dict(text='Value (NTD)'), tickformat='$,.0f'),
+    )
+    _DRAWDOWN_LAYOUT = dict(
+        title=dict(text='Portfolio Drawdown'),
+        hovermode='x unified',
+        xaxis=_DATE_AXIS,
+        yaxis=dict(title=dict(text='Drawdown from Peak (%)'), tickformat='.1f', ticksuffix='%'),
+    )
+    _PNL_LAYOUT = dict(
+        title=dict(text='P&L per Trade'),
+        xaxis=dict(title=dict(text='Trades (sorted)'), showticklabels=False),
+        yaxis=dict(title=dict(text='P&L (NTD)'), tickformat='$,.0f', zeroline=False),
+        bargap=0.15,
+        # Loss and win bars are separate traces on disjoint x positions
+        barmode='overlay',
+        margin=dict(t=60),
+        shapes=[dict(_ZERO_LINE, line=dict(width=1.5, color='#555'))],
+    )
+    _CUMULATIVE_LAYOUT = dict(
+        title=dict(text='Cumulative P&L'),
+        hovermode='x unified',
+        xaxis=_DATE_AXIS,
+        yaxis=dict(title=dict(text='Cumulative P&L (NTD)'), tickformat='$,.0f', zeroline=False),
+        margin=dict(t=40),
+        shapes=[dict(_ZERO_LINE, line=dict(dash='dot', width=1, color='#999'))],
+    )
+
     def __init__(self):
         """Initialize chart generator."""
         self.colors = {
@@ -29,56 +143,167 @@ class ChartGenerator:
             'neutral': '#95a5a6',
             'background': '#ffffff'
         }
+        # Line traces longer than this are downsampled before plotting
+        self.max_points = 800
+        # The price chart's subplot grid never changes, so lay it out once and
+        # only swap the traces and trade shapes in on each call
+        self._price_layout = self._build_price_layout() if PLOTLY_AVAILABLE else None
+        # Chart specs, keyed on input fingerprints (see _cached_spec)
+        self.max_cached_figures = 32
+        self._figure_cache = OrderedDict()
+        self._figure_cache_lock = threading.Lock()
+
+    def _build_price_layout(self) -> dict:
+        """Lay out the two-row price/volume grid as a plain layout dict."""
+        from plotly.subplots import make_subplots
 
-    def plot_equity_curve(self, equity_data: pd.DataFrame, trades: pd.DataFrame = None) -> Optional[go.Figure]:
-        """Plot equity curve with optional trade markers."""
-        if not PLOTLY_AVAILABLE or equity_data.empty:
-            return None
+        fig = make_subplots(
+            rows=2, cols=1, shared_xaxes=True,
+            vertical_spacing=0.03, row_heights=[0.75, 0.25],
+        )
+        fig.update_layout(
+            title='TSMC (2330.TW) — Price Chart (NTD)',
+            hovermode='x unified',
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            xaxis2=dict(type='date', tickformat='%Y-%m-%d', tickangle=-45),
+            yaxis=dict(title='Price (NTD)', tickformat=',.0f'),
+            yaxis2=dict(title='Volume'),
+            xaxis_rangeslider_visible=False, height=620,
+        )
+        layout = fig.layout.to_plotly_json()
+        # _figure supplies plotly_white in place of make_subplots' default template
+        layout.pop('template', None)
+        return layout
+
+    def _figure(self, traces: List[dict], layout: dict) -> go.Figure:
+        """
+        Assemble a figure from raw trace/layout dicts, skipping graph_objs validation.
+
+        Without validation nothing is coerced, so specs must already be in
+        plotly.js form: explicit trace ``type``, ``title=dict(text=...)`` and a
+        template object rather than its name.
+        """
+        if 'template' not in layout:
+            layout = dict(layout, template=pio.templates['plotly_white'])
+        return go.Figure(data=traces, layout=layout, _validate=False)
+
+    def _build(self, spec: Optional[ChartSpec]) -> Optional[go.Figure]:
+        """Figure for a chart spec, or None when the chart has nothing to show."""
+        return None if spec is None else self._figure(*spec)
+
+    def _downsample(self, dates: pd.Series, values: pd.Series):
+        """Reduce a line series to at most ``max_points`` points with LTTB."""
+        if len(values) <= self.max_points:
+            return dates, values
+
+        x = dates.to_numpy(dtype='datetime64[ns]').astype(np.int64).astype(np.float64)
+        idx = lttb_indices(x, values.to_numpy(dtype=np.float64), self.max_points)
+        return dates.iloc[idx], values.iloc[idx]
+
+    @staticmethod
+    def _trade_column(trades: pd.DataFrame, column: str, default) -> pd.Series:
+        """``trades[column]`` with gaps filled by ``default``, or all ``default`` if absent."""
+        if column not in trades.columns:
+            return pd.Series(default, index=trades.index)
+        # object first so a Categorical column accepts a default outside its
+        # categories; where() rather than fillna() avoids its downcasting warning
+        values = trades[column].astype(object)
+        return values.where(values.notna(), default)
+
+    @staticmethod
+    def _with_pnl_suffix(texts: pd.Series, trades: pd.DataFrame, action: str) -> List[str]:
+        """Append the realised P&L to SELL labels that have one."""
+        if action == 'SELL' and 'pnl' in trades.columns:
+            pnl = trades['pnl']
+            has_pnl = pnl.notna() & (pnl != 0)
+            texts = texts.where(~has_pnl, texts + "<br>P&L: " + pnl.map('${:+,.0f}'.format))
+        return texts.tolist()
+
+    @staticmethod
+    def _action_masks(actions: pd.Series, *labels: str) -> dict:
+        """Row masks per action label, compared on int8 category codes rather than strings."""
+        if not isinstance(actions.dtype, pd.CategoricalDtype):
+            actions = actions.astype('category')
+        codes = actions.cat.codes.to_numpy()
+        categories = actions.cat.categories
+        return {
+            label: codes == categories.get_loc(label) if label in categories
+            else np.zeros(codes.size, dtype=bool)
+            for label in labels
+        }
 
-        fig = go.Figure()
+    def _trade_hover_texts(self, trades: pd.DataFrame, action: str) -> List[str]:
+        """Build equity-curve marker hover labels column-wise."""
+        qty_column = 'shares' if 'shares' in trades.columns else 'quantity'
+        qty = self._trade_column(trades, qty_column, 'N/A')
+        symbol = self._trade_column(trades, 'symbol', '2330')
+        price = self._trade_column(trades, 'price', 0.0)
+
+        texts = (
+            f"{action} " + symbol.astype(str)
+            + "<br>Qty: " + qty.astype(str)
+            + "<br>Price: " + price.map('${:,.0f}'.format)
+        )
+        return self._with_pnl_suffix(texts, trades, action)
 
-        fig.add_trace(go.Scatter(
-            x=equity_data['date'],
-            y=equity_data['equity'],
+    @_needs_plotly
+    def plot_equity_curve(self, equity_data: pd.DataFrame, trades: pd.DataFrame = None) -> Optional[go.Figure]:
+        """Plot equity curve with optional trade markers."""
+        return self._build(self._equity_curve_spec(equity_data, trades))
+
+    @_cached_spec
+    def _equity_curve_spec(self, equity_data: pd.DataFrame, trades: pd.DataFrame = None) -> Optional[ChartSpec]:
+        """Equity line plus BUY/SELL marker traces."""
+        # Chronological order is the precondition for the marker lookup below
+        if not equity_data['date'].is_monotonic_increasing:
+            equity_data = equity_data.sort_values('date', kind='stable')
+        dates = equity_data['date']
+        equity = equity_data['equity']
+
+        line_dates, line_equity = self._downsample(dates, equity)
+        traces = [dict(
+            type='scattergl',
+            x=line_dates,
+            y=line_equity.to_numpy(dtype=np.float32),
             mode='lines',
             name='Portfolio Value',
             line=dict(color=self.colors['primary'], width=2),
             fill='tozeroy',
             fillcolor='rgba(31, 119, 180, 0.1)',
             hovertemplate='%{x|%Y-%m-%d}<br>Value: $%{y:,.0f}<extra></extra>'
-        ))
+        )]
 
         if trades is not None and not trades.empty:
-            trades_with_dates = trades.copy()
-            if 'date' in trades_with_dates.columns:
-                trades_with_dates['date'] = pd.to_datetime(trades_with_dates['date'])
+            trades_with_dates = trades
+            if 'date' in trades.columns:
+                if not is_datetime64_any_dtype(trades['date']):
+                    trades_with_dates = trades.assign(date=pd.to_datetime(trades['date']))
+
+                # Each marker takes the last equity value on or before its day
+                # via binary search over the sorted datetime64[D] days
+                equity_days = dates.to_numpy().astype('datetime64[D]')
+                equity_values = equity.to_numpy()
+                first_equity = equity_values[0]
+                masks = self._action_masks(trades_with_dates['action'], 'BUY', 'SELL')
 
                 for action, color, symbol_shape, direction in [
                     ('BUY', self.colors['success'], 'triangle-up', 'Buy'),
                     ('SELL', self.colors['danger'], 'triangle-down', 'Sell')
                 ]:
-                    action_trades = trades_with_dates[trades_with_dates['action'] == action]
+                    action_trades = trades_with_dates.iloc[masks[action]]
                     if action_trades.empty:
                         continue
 
-                    equities = []
-                    for trade_date in action_trades['date']:
-                        matching = equity_data[equity_data['date'].dt.date <= trade_date.date()]
-                        equities.append(matching['equity'].iloc[-1] if not matching.empty else equity_data['equity'].iloc[0])
-
-                    hover_texts = []
-                    for _, trade in action_trades.iterrows():
-                        qty = trade.get('shares', trade.get('quantity', 'N/A'))
-                        price = trade.get('price', 0)
-                        text = f"{action} {trade.get('symbol', '2330')}<br>Qty: {qty}<br>Price: ${price:,.0f}"
-                        if action == 'SELL' and 'pnl' in trade and trade['pnl'] != 0:
-                            pnl = trade['pnl']
-                            text += f"<br>P&L: ${pnl:+,.0f}"
-                        hover_texts.append(text)
-
-                    fig.add_trace(go.Scatter(
+                    trade_days = action_trades['date'].to_numpy().astype('datetime64[D]')
+                    idx = np.searchsorted(equity_days, trade_days, side='right') - 1
+                    equities = np.where(idx >= 0, equity_values[np.maximum(idx, 0)], first_equity)
+
+                    hover_texts = self._trade_hover_texts(action_trades, action)
+
+                    traces.append(dict(
+                        type='scattergl',
                         x=action_trades['date'],
-                        y=equities,
+                        y=equities.astype(np.float32),
                         mode='markers',
                         name=action,
                         marker=dict(symbol=symbol_shape, size=14, color=color,
@@ -87,120 +312,102 @@ class ChartGenerator:
                         hovertemplate='%{text}<br>Date: %{x|%Y-%m-%d}<extra></extra>'
                     ))
 
-        fig.update_layout(
-            title='Portfolio Equity Curve',
-            xaxis_title='Date',
-            yaxis_title='Value (NTD)',
-            hovermode='x unified',
-            template='plotly_white',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            xaxis=dict(type='date', tickformat='%Y-%m-%d', tickangle=-45),
-            yaxis=dict(tickformat='$,.0f'),
-        )
-
-        return fig
+        return traces, self._EQUITY_LAYOUT
 
+    @_needs_plotly
     def plot_drawdown(self, drawdown_data: pd.DataFrame) -> Optional[go.Figure]:
         """Plot drawdown over time."""
-        if not PLOTLY_AVAILABLE or drawdown_data.empty:
-            return None
+        return self._build(self._drawdown_spec(drawdown_data))
 
-        fig = go.Figure()
-
-        fig.add_trace(go.Scatter(
+    @_cached_spec
+    def _drawdown_spec(self, drawdown_data: pd.DataFrame) -> Optional[ChartSpec]:
+        """Drawdown line trace."""
+        traces = [dict(
+            type='scattergl',
             x=drawdown_data['date'],
-            y=drawdown_data['drawdown'] * 100,
+            y=(drawdown_data['drawdown'] * 100).to_numpy(dtype=np.float32),
             mode='lines',
             name='Drawdown',
             line=dict(color=self.colors['danger'], width=2),
             fill='tozeroy',
             fillcolor='rgba(231, 76, 60, 0.2)',
             hovertemplate='%{x|%Y-%m-%d}<br>Drawdown: %{y:.2f}%<extra></extra>'
-        ))
-
-        fig.update_layout(
-            title='Portfolio Drawdown',
-            xaxis_title='Date',
-            yaxis_title='Drawdown from Peak (%)',
-            hovermode='x unified',
-            template='plotly_white',
-            xaxis=dict(type='date', tickformat='%Y-%m-%d', tickangle=-45),
-            yaxis=dict(tickformat='.1f', ticksuffix='%'),
-        )
+        )]
 
-        return fig
+        return traces, self._DRAWDOWN_LAYOUT
 
+    @_needs_plotly
     def plot_pnl_distribution(self, trades: pd.DataFrame) -> Optional[go.Figure]:
         """Plot P&L distribution as a waterfall bar chart."""
-        if not PLOTLY_AVAILABLE or trades.empty or 'pnl' not in trades.columns:
-            return None
-
-        pnl_values = trades['pnl'].dropna()
-        pnl_values = pnl_values[pnl_values != 0]
+        return self._build(self._pnl_distribution_spec(trades))
 
-        if pnl_values.empty:
+    @_cached_spec
+    def _pnl_distribution_spec(self, trades: pd.DataFrame) -> Optional[ChartSpec]:
+        """Sorted per-trade P&L bars, or None without P&L."""
+        if 'pnl' not in trades.columns:
             return None
 
-        fig = go.Figure()
+        # One sign-partition pass; NaN and break-even trades fall in neither side
+        wins, losses, _ = pnl_partition(trades['pnl'].to_numpy(dtype=np.float64))
+        n_trades = wins.size + losses.size
+        if n_trades == 0:
+            return None
 
         # Individual trade P&L as a bar chart (sorted by value) — cleaner than histogram
-        sorted_pnl = pnl_values.sort_values().reset_index(drop=True)
-        bar_colors = ['rgba(231, 76, 60, 0.85)' if v < 0 else 'rgba(46, 204, 113, 0.85)' for v in sorted_pnl]
-        border_colors = ['#c0392b' if v < 0 else '#27ae60' for v in sorted_pnl]
-
-        fig.add_trace(go.Bar(
-            x=list(range(len(sorted_pnl))),
-            y=sorted_pnl,
-            marker=dict(
-                color=bar_colors,
-                line=dict(width=1, color=border_colors),
-            ),
-            hovertemplate='Trade #%{x}<br>P&L: $%{y:,.0f}<extra></extra>',
-            showlegend=False,
-        ))
-
-        # Zero line
-        fig.add_hline(y=0, line_width=1.5, line_color='#555')
-
-        # Annotations for summary stats
-        avg_pnl = pnl_values.mean()
-        total_pnl = pnl_values.sum()
-        fig.add_annotation(
-            text=f"Avg: ${avg_pnl:+,.0f} | Total: ${total_pnl:+,.0f}",
-            xref="paper", yref="paper", x=0.5, y=1.08,
-            showarrow=False, font=dict(size=12, color='#555'),
-        )
-
-        fig.update_layout(
-            title='P&L per Trade',
-            xaxis_title='Trades (sorted)',
-            yaxis_title='P&L (NTD)',
-            template='plotly_white',
-            xaxis=dict(showticklabels=False),
-            yaxis=dict(tickformat='$,.0f', zeroline=False),
-            bargap=0.15,
-            margin=dict(t=60),
+        # Losses then wins, one trace each so colours are scalars rather than per-bar lists
+        traces = []
+        offset = 0
+        for values, color, border in [
+            (losses, 'rgba(231, 76, 60, 0.85)', '#c0392b'),
+            (wins, 'rgba(46, 204, 113, 0.85)', '#27ae60'),
+        ]:
+            if values.size:
+                traces.append(dict(
+                    type='bar',
+                    x=np.arange(offset, offset + values.size),
+                    y=np.sort(values).astype(np.float32),
+                    marker=dict(color=color, line=dict(width=1, color=border)),
+                    hovertemplate='Trade #%{x}<br>P&L: $%{y:,.0f}<extra></extra>',
+                    showlegend=False,
+                ))
+            offset += values.size
+
+        total_pnl = wins.sum() + losses.sum()
+        avg_pnl = total_pnl / n_trades
+
+        layout = dict(
+            self._PNL_LAYOUT,
+            # Annotations for summary stats
+            annotations=[dict(
+                text=f"Avg: ${avg_pnl:+,.0f} | Total: ${total_pnl:+,.0f}",
+                xref="paper", yref="paper", x=0.5, y=1.08,
+                showarrow=False, font=dict(size=12, color='#555'),
+            )],
         )
 
-        return fig
+        return traces, layout
 
+    @_needs_plotly
     def plot_cumulative_pnl(self, trades: pd.DataFrame) -> Optional[go.Figure]:
         """Plot cumulative P&L over time with gradient fill."""
-        if not PLOTLY_AVAILABLE or trades.empty:
-            return None
+        return self._build(self._cumulative_pnl_spec(trades))
 
+    @_cached_spec
+    def _cumulative_pnl_spec(self, trades: pd.DataFrame) -> Optional[ChartSpec]:
+        """Cumulative P&L line over SELL trades, or None without any."""
         if 'pnl' not in trades.columns or 'date' not in trades.columns:
             return None
 
         # Only include SELL trades (which have P&L)
-        sell_trades = trades[trades['action'] == 'SELL'].copy() if 'action' in trades.columns else trades.copy()
+        if 'action' in trades.columns:
+            sell_trades = trades.iloc[self._action_masks(trades['action'], 'SELL')['SELL']]
+        else:
+            sell_trades = trades
         if sell_trades.empty or sell_trades['pnl'].sum() == 0:
             return None
 
         sell_trades = sell_trades.sort_values('date')
-        sell_trades['cumulative_pnl'] = sell_trades['pnl'].cumsum()
-
-        fig = go.Figure()
+        _, _, sell_trades['cumulative_pnl'] = pnl_partition(sell_trades['pnl'].to_numpy(dtype=np.float64))
 
         cum_values = sell_trades['cumulative_pnl']
         final_val = cum_values.iloc[-1]
@@ -210,124 +417,116 @@ class ChartGenerator:
         fill_color = 'rgba(46, 204, 113, 0.15)' if is_positive else 'rgba(231, 76, 60, 0.15)'
         line_color = '#27ae60' if is_positive else '#c0392b'
 
-        fig.add_trace(go.Scatter(
+        # WebGL traces have no spline smoothing, so the line is drawn linear
+        traces = [dict(
+            type='scattergl',
             x=sell_trades['date'],
-            y=cum_values,
+            y=cum_values.to_numpy(dtype=np.float32),
             mode='lines+markers',
             name='Cumulative P&L',
-            line=dict(color=line_color, width=2.5, shape='spline'),
+            line=dict(color=line_color, width=2.5),
             marker=dict(size=7, color=line_color, line=dict(width=1, color='white')),
             fill='tozeroy',
             fillcolor=fill_color,
             hovertemplate='%{x|%Y-%m-%d}<br>Cumulative P&L: $%{y:,.0f}<extra></extra>'
-        ))
-
-        # Zero line
-        fig.add_hline(y=0, line_dash="dot", line_width=1, line_color='#999')
+        )]
 
         # Annotate final value
-        fig.add_annotation(
+        annotations = [dict(
             x=sell_trades['date'].iloc[-1],
             y=final_val,
             text=f"${final_val:+,.0f}",
             showarrow=True, arrowhead=0, arrowcolor=line_color,
             font=dict(size=13, color=line_color, family='Arial Black'),
             bgcolor='white', bordercolor=line_color, borderwidth=1, borderpad=4,
-        )
+        )]
 
         # Annotate peak/trough
         peak_idx = cum_values.idxmax()
         trough_idx = cum_values.idxmin()
         if cum_values.loc[peak_idx] > 0:
-            fig.add_annotation(
+            annotations.append(dict(
                 x=sell_trades.loc[peak_idx, 'date'], y=cum_values.loc[peak_idx],
                 text=f"Peak: ${cum_values.loc[peak_idx]:+,.0f}",
                 showarrow=True, arrowhead=2, ay=-30,
                 font=dict(size=10, color='#27ae60'), opacity=0.8,
-            )
+            ))
         if cum_values.loc[trough_idx] < 0:
-            fig.add_annotation(
+            annotations.append(dict(
                 x=sell_trades.loc[trough_idx, 'date'], y=cum_values.loc[trough_idx],
                 text=f"Trough: ${cum_values.loc[trough_idx]:+,.0f}",
                 showarrow=True, arrowhead=2, ay=30,
                 font=dict(size=10, color='#c0392b'), opacity=0.8,
-            )
-
-        fig.update_layout(
-            title='Cumulative P&L',
-            xaxis_title='Date',
-            yaxis_title='Cumulative P&L (NTD)',
-            hovermode='x unified',
-            template='plotly_white',
-            xaxis=dict(type='date', tickformat='%Y-%m-%d', tickangle=-45),
-            yaxis=dict(tickformat='$,.0f', zeroline=False),
-            margin=dict(t=40),
-        )
+            ))
 
-        return fig
+        layout = dict(self._CUMULATIVE_LAYOUT, annotations=annotations)
+        return traces, layout
 
+    @_needs_plotly
     def plot_price_chart(self, price_data: pd.DataFrame, trades: pd.DataFrame = None) -> Optional[go.Figure]:
         """Plot TSMC price candlestick chart with trade markers and volume."""
-        if not PLOTLY_AVAILABLE or price_data.empty:
-            return None
-
-        from plotly.subplots import make_subplots
-
-        fig = make_subplots(
-            rows=2, cols=1, shared_xaxes=True,
-            vertical_spacing=0.03, row_heights=[0.75, 0.25],
-        )
+        return self._build(self._price_chart_spec(price_data, trades))
 
-        fig.add_trace(go.Candlestick(
+    @_cached_spec
+    def _price_chart_spec(self, price_data: pd.DataFrame, trades: pd.DataFrame = None) -> Optional[ChartSpec]:
+        """Candlestick, volume and trade marker traces on the price grid."""
+        traces = [dict(
+            type='candlestick',
             x=price_data['date'],
             open=price_data['open'], high=price_data['high'],
             low=price_data['low'], close=price_data['close'],
             showlegend=False,
-            increasing_line_color=self.colors['success'],
-            decreasing_line_color=self.colors['danger'],
-        ), row=1, col=1)
+            increasing=dict(line=dict(color=self.colors['success'])),
+            decreasing=dict(line=dict(color=self.colors['danger'])),
+            xaxis='x', yaxis='y',
+        )]
 
         vol_colors = [self.colors['success'] if c >= o else self.colors['danger']
                       for c, o in zip(price_data['close'], price_data['open'])]
-        fig.add_trace(go.Bar(
+        traces.append(dict(
+            type='bar',
             x=price_data['date'], y=price_data['volume'],
-            name='Volume', marker_color=vol_colors, opacity=0.5,
+            name='Volume', marker=dict(color=vol_colors), opacity=0.5,
             showlegend=False,
-            hovertemplate='%{x|%Y-%m-%d}<br>Vol: %{y:,.0f}<extra></extra>'
-        ), row=2, col=1)
+            hovertemplate='%{x|%Y-%m-%d}<br>Vol: %{y:,.0f}<extra></extra>',
+            xaxis='x2', yaxis='y2',
+        ))
 
+        shapes = []
         if trades is not None and not trades.empty:
-            tp = trades.copy()
-            tp['date'] = pd.to_datetime(tp['date'])
+            tp = trades
+            if not is_datetime64_any_dtype(tp['date']):
+                tp = trades.assign(date=pd.to_datetime(trades['date']))
             marker_cfg = {
                 'BUY': {'color': '#0066FF', 'shape': 'triangle-up', 'outline': '#001a44',
                          'vline': 'rgba(0, 102, 255, 0.22)'},
                 'SELL': {'color': '#FF6600', 'shape': 'triangle-down', 'outline': '#441a00',
                           'vline': 'rgba(255, 102, 0, 0.22)'},
             }
+            masks = self._action_masks(tp['action'], *marker_cfg)
             for action, cfg in marker_cfg.items():
-                subset = tp[tp['action'] == action]
+                subset = tp.iloc[masks[action]]
                 if subset.empty:
                     continue
 
                 # Dashed vertical lines spanning full chart height via shapes
-                for trade_date in subset['date']:
-                    date_str = trade_date.strftime('%Y-%m-%d')
-                    fig.add_shape(
+                trade_days = np.datetime_as_string(subset['date'].to_numpy().astype('datetime64[D]'))
+                for date_str in trade_days.tolist():
+                    shapes.append(dict(
                         type='line',
                         x0=date_str, x1=date_str, y0=0, y1=1,
                         xref='x', yref='paper',
                         line=dict(color=cfg['vline'], width=1, dash='dash'),
                         layer='below',
-                    )
-
-                hovers = []
-                for _, t in subset.iterrows():
-                    h = f"{action} {t.get('shares', '')}sh @ ${t.get('price', 0):,.0f}"
-                    if action == 'SELL' and t.get('pnl', 0) != 0:
-                        h += f"<br>P&L: ${t['pnl']:+,.0f}"
-                    hovers.append(h)
-                fig.add_trace(go.Scatter(
+                    ))
+
+                hover_texts = (
+                    f"{action} " + self._trade_column(subset, 'shares', '').astype(str)
+                    + "sh @ " + self._trade_column(subset, 'price', 0.0).map('${:,.0f}'.format)
+                )
+                hovers = self._with_pnl_suffix(hover_texts, subset, action)
+                traces.append(dict(
+                    type='scatter',
                     x=subset['date'], y=subset['price'],
                     mode='markers+text', name=action,
                     marker=dict(
@@ -335,20 +534,13 @@ class ChartGenerator:
                         line=dict(width=2.5, color=cfg['outline']),
                         opacity=0.95,
                     ),
-                    text=[action[0] for _ in subset.iterrows()],
+                    text=[action[0]] * len(subset),
                     textposition='top center' if action == 'BUY' else 'bottom center',
                     textfont=dict(size=10, color=cfg['color'], family='Arial Black'),
                     hovertext=hovers,
-                    hovertemplate='%{hovertext}<br>%{x|%Y-%m-%d}<extra></extra>'
-                ), row=1, col=1)
+                    hovertemplate='%{hovertext}<br>%{x|%Y-%m-%d}<extra></extra>',
+                    xaxis='x', yaxis='y',
+                ))
 
-        fig.update_layout(
-            title='TSMC (2330.TW) — Price Chart (NTD)',
-            hovermode='x unified', template='plotly_white',
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            xaxis2=dict(type='date', tickformat='%Y-%m-%d', tickangle=-45),
-            yaxis=dict(title='Price (NTD)', tickformat=',.0f'),
-            yaxis2=dict(title='Volume'),
-            xaxis_rangeslider_visible=False, height=620,
-        )
-        return fig
+        layout = dict(self._price_layout, shapes=shapes)
+        return traces, layout
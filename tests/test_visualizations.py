@@ -0,0 +1,43 @@
+"""Regression checks for chart generation."""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.visualizations import ChartGenerator, _arg_fingerprint
+
+
+class NestedTradeFieldTest(unittest.TestCase):
+    """Trade logs may carry list/dict fields the charts never read."""
+
+    def setUp(self):
+        self.charts = ChartGenerator()
+        self.equity = pd.DataFrame({
+            'date': pd.date_range('2025-01-01', periods=5),
+            'equity': np.arange(100000.0, 100005.0),
+        })
+        self.trades = pd.DataFrame({
+            'date': pd.to_datetime(['2025-01-02', '2025-01-04']),
+            'action': ['BUY', 'SELL'],
+            'symbol': ['2330', '2330'],
+            'shares': [10, 10],
+            'price': [900.0, 950.0],
+            'pnl': [0.0, 500.0],
+            'signals': [['rsi'], ['macd', 'volume']],
+            'metadata': [{'source': 'bot'}, {'source': 'bot'}],
+        })
+
+    def test_charts_render_with_nested_fields(self):
+        self.assertIsNotNone(self.charts.plot_equity_curve(self.equity, self.trades))
+        self.assertIsNotNone(self.charts.plot_cumulative_pnl(self.trades))
+        self.assertIsNotNone(self.charts.plot_pnl_distribution(self.trades))
+
+    def test_nested_fields_are_fingerprinted(self):
+        same = self.trades.copy()
+        changed = self.trades.assign(signals=[['rsi'], ['macd']])
+        self.assertEqual(_arg_fingerprint(self.trades), _arg_fingerprint(same))
+        self.assertNotEqual(_arg_fingerprint(self.trades), _arg_fingerprint(changed))
+
+if __name__ == '__main__':
+    unittest.main()